@@ -1,13 +1,41 @@
 #!/usr/bin/env python3
-from genericpath import isfile
 import os
 import json
+from datetime import datetime
+
+# month names indexed by month number, used in the markdown paths
+MONTHS = (None, 'january', 'february', 'march', 'april', 'may', 'june',
+          'july', 'august', 'september', 'october', 'november', 'december')
 #----------------------------------------
 
-def createTimeline(year_dict):
+def writeJson(json_path, data):
+    # write to a temporary file and swap it in, so a failed write never truncates the list
+    tmp_path = f"{json_path}.tmp"
+    with open(tmp_path, 'w') as json_out:
+        json_out.write(json.dumps(data, indent=4))
+    os.replace(tmp_path, json_path)
+
+
+def createFile(file_path):
+    # create an empty file, raises FileExistsError if it is already there
+    os.close(os.open(file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+
+
+def inputDate(prompt):
+    # keep asking until the date parses as yyyy-mm-dd
+    while True:
+        date = input(prompt)
+        try:
+            return datetime.strptime(date.strip(), "%Y-%m-%d").date()
+        except ValueError:
+            print("[-] Please enter a valid date in the format yyyy-mm-dd.")
+
+
+def createTimeline():
 
     # get the date and title from the user to populate the json file
-    date = input(">> Input date in the format (1998-10-10/yyyy-mm-dd):\n   date: ")
+    entry_date = inputDate(">> Input date in the format (1998-10-10/yyyy-mm-dd):\n   date: ")
+    date = entry_date.isoformat()
     print("-----------------------")
     title = input(">> Input title for the timeline:\n   title: ")
     print("-----------------------")
@@ -27,14 +55,13 @@ def createTimeline(year_dict):
     github_url = "https://raw.githubusercontent.com/wannabemrrobot/daily-progress/main/cron@daily/"
 
     
-    year = date.split('-')[0]
-    month = date.split('-')[1]
-    day = date.split('-')[2]
+    year, month, day = f"{entry_date.year:04d}", f"{entry_date.month:02d}", f"{entry_date.day:02d}"
+    month_name = MONTHS[entry_date.month]
 
     # the file that needs to be created
-    file_name = f"{day}-{year_dict.get(month)}-{year}.md"
+    file_name = f"{day}-{month_name}-{year}.md"
     # the complete file url for public access
-    file_url = f"{github_url}{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}.md"
+    file_url = f"{github_url}{year}/{month}-{month_name}/{day}-{month_name}-{year}.md"
 
     # json object with data from the user
     if(milestone == "True"):
@@ -52,48 +79,43 @@ def createTimeline(year_dict):
             "url": file_url
         }
 
-    # open json file to get the file contents(json list)
-    json_file = open(timeline_file)
-    data = json.load(json_file)
-
-    # insert new json object into existing list of json objects
-    data.insert(0, timeline_obj)
     file_exist = False
 
-    if(os.path.isdir(f"{working_dir}/{year}") == False):
-        print(f"[!] {working_dir}/{year} : does not exists, creating directory and timeline markdown...")
-        os.mkdir(f"{working_dir}/{year}")
-        os.mkdir(f"{working_dir}/{year}/{month}-{year_dict.get(month)}")
-        file = open(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{file_name}", "x")
-        file.close()
-    else:
-        if(os.path.isdir(f"{working_dir}/{year}/{month}-{year_dict.get(month)}") == False):
-            print(f"[!] {working_dir}/{year}/{month}-{year_dict.get(month)} : does not exists, creating directory and timeline markdown...")
-            os.mkdir(f"{working_dir}/{year}/{month}-{year_dict.get(month)}")
-            file = open(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{file_name}", "x")
-            file.close()
-        else:
-            if(os.path.isfile(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{file_name}") == False):
-                print(f"[!] {working_dir}/{year}/{month}-{year_dict.get(month)}/{file_name} : does not exists, creating timeline markdown...")
-                file = open(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{file_name}", "x")
-                file.close()
-            else:
-                print(f"[!] {working_dir}/{year}/{month}-{year_dict.get(month)}/{file_name} : file already exists.")
-                file_exist = True
+    # directory and markdown file for the timeline entry
+    dir_path = os.path.join(working_dir, year, f"{month}-{month_name}")
+    file_path = os.path.join(dir_path, file_name)
+
+    # try the markdown file first, the month directory usually exists already
+    try:
+        try:
+            createFile(file_path)
+        except FileNotFoundError:
+            print(f"[!] {dir_path} : does not exists, creating directory and timeline markdown...")
+            os.makedirs(dir_path, exist_ok=True)
+            createFile(file_path)
+    except FileExistsError:
+        print(f"[!] {file_path} : file already exists.")
+        file_exist = True
     
     if(file_exist == False):
-        with open(timeline_file, 'w') as json_out:
-            json.dump(data, json_out, indent=4)
-            print("-----------------------")
-            print("[!] Timeline entry addition successful")
-            print("-----------------------")
-            json_out.close()
+        # open json file to get the file contents(json list)
+        with open(timeline_file, "rb") as json_file:
+            data = json.loads(json_file.read())
 
+        # insert new json object into existing list of json objects
+        data.insert(0, timeline_obj)
 
-def createPost(year_dict):
+        writeJson(timeline_file, data)
+        print("-----------------------")
+        print("[!] Timeline entry addition successful")
+        print("-----------------------")
+
+
+def createPost():
     # get the post name, date, tags and description from the user
     post_title = input(">> Input the post title: \n   post title: ")
-    post_date = input(">> Input date in the format (1998-10-10/yyyy-mm-dd): \n   date: ")
+    entry_date = inputDate(">> Input date in the format (1998-10-10/yyyy-mm-dd): \n   date: ")
+    post_date = entry_date.isoformat()
     post_tags = list(map(str, input(">> Input the tags for the post, separated by commas: \n   tags: ").split(',')))
     post_description = input(">> Input the post description: \n   description: ")
     print("-----------------------")
@@ -105,69 +127,54 @@ def createPost(year_dict):
     # github url to fetch the posts file
     github_url = "https://raw.githubusercontent.com/wannabemrrobot/daily-progress/main/posts/"
 
-    year = post_date.split('-')[0]
-    month = post_date.split('-')[1]
-    day = post_date.split('-')[2]
+    year, month, day = f"{entry_date.year:04d}", f"{entry_date.month:02d}", f"{entry_date.day:02d}"
+    month_name = MONTHS[entry_date.month]
 
     # the file that needs to be created
-    file_name = f"{day}-{year_dict.get(month)}-{year}.md"
+    file_name = f"{day}-{month_name}-{year}.md"
     # the complete file url for public access
-    file_url = f"{github_url}{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}/{day}-{year_dict.get(month)}-{year}.md"
-
-    # open json file to get the file contents(json list)
-    json_file = open(postslist_file)
-    data = json.load(json_file)
-
-    # json object with data from user
-    post_obj = {
-        "postno": len(data) + 1,
-        "title": post_title,
-        "date": post_date,
-        "url": file_url,
-        "tags": post_tags,
-        "description": post_description
-    }
+    file_url = f"{github_url}{year}/{month}-{month_name}/{day}-{month_name}-{year}/{day}-{month_name}-{year}.md"
 
-    # insert new json object into existing list of json objects
-    data.insert(0, post_obj)
     file_exist = False
 
-    if(os.path.isdir(f"{working_dir}/{year}") == False):
-        print(f"[!] {working_dir}/{year} : does not exists, creating directory and post markdown...")
-        os.mkdir(f"{working_dir}/{year}")
-        os.mkdir(f"{working_dir}/{year}/{month}-{year_dict.get(month)}")
-        os.mkdir(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}")
-        file = open(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}/{file_name}", "x")
-        file.close()
-    else:
-        if(os.path.isdir(f"{working_dir}/{year}/{month}-{year_dict.get(month)}") == False):
-            print(f"[!] {working_dir}/{year}/{month}-{year_dict.get(month)} : does not exists, creating directory and post markdown...")
-            os.mkdir(f"{working_dir}/{year}/{month}-{year_dict.get(month)}")
-            os.mkdir(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}")
-            file = open(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}/{file_name}", "x")
-            file.close()
-        else:
-            if(os.path.isdir(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}") == False):
-                print(f"[!] {working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year} : does not exists, creating directory and post markdown...")
-                os.mkdir(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}")
-                file = open(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}/{file_name}", "x")
-                file.close()
-            else:
-                if(os.path.isfile(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}/{file_name}") == False):
-                    print(f"[!] {working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}/{file_name} : does not exists, creating post markdown...")
-                    file = open(f"{working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}/{file_name}", "x")
-                    file.close()
-                else:
-                    print(f"[!] {working_dir}/{year}/{month}-{year_dict.get(month)}/{day}-{year_dict.get(month)}-{year}/{file_name} : file already exists.")
-                    file_exist = True
+    # directory and markdown file for the post
+    post_dir = os.path.join(working_dir, year, f"{month}-{month_name}", f"{day}-{month_name}-{year}")
+    file_path = os.path.join(post_dir, file_name)
+
+    # try the markdown file first, the post directory is created only if missing
+    try:
+        try:
+            createFile(file_path)
+        except FileNotFoundError:
+            print(f"[!] {post_dir} : does not exists, creating directory and post markdown...")
+            os.makedirs(post_dir, exist_ok=True)
+            createFile(file_path)
+    except FileExistsError:
+        print(f"[!] {file_path} : file already exists.")
+        file_exist = True
     
     if(file_exist == False):
-        with open(postslist_file, 'w') as json_out:
-            json.dump(data, json_out, indent=4)
-            print("-----------------------")
-            print("[!] Post entry addition successful")
-            print("-----------------------")
-            json_out.close()
+        # open json file to get the file contents(json list)
+        with open(postslist_file, "rb") as json_file:
+            data = json.loads(json_file.read())
+
+        # json object with data from user
+        post_obj = {
+            "postno": len(data) + 1,
+            "title": post_title,
+            "date": post_date,
+            "url": file_url,
+            "tags": post_tags,
+            "description": post_description
+        }
+
+        # insert new json object into existing list of json objects
+        data.insert(0, post_obj)
+
+        writeJson(postslist_file, data)
+        print("-----------------------")
+        print("[!] Post entry addition successful")
+        print("-----------------------")
 
 def createTheme():
     # get the theme name from the user
@@ -180,61 +187,58 @@ def createTheme():
     
     theme_file = f"{theme_name}.json"
     theme_url = f"{github_url}{theme_file}"
+    theme_path = os.path.join(working_dir, theme_file)
 
     theme_obj = {
         "theme": theme_name,
         "url": theme_url
     }
 
-    # open json file to get the file contents(json list)
-    json_file = open(themelist_file)
-    data = json.load(json_file)
-    data.append(theme_obj)
-    
-    if(os.path.isfile(f"{working_dir}/{theme_file}") == False):
+    file_exist = False
+
+    # create the theme file directly, an existing file means the name is taken
+    try:
+        createFile(theme_path)
         print(f"[!] {theme_file} does not exists. Creating file...")
-        file = open(f"{working_dir}/{theme_file}", "x")
-        file.close()
-
-        with open(themelist_file, 'w') as json_out:
-            json.dump(data, json_out, indent=4)
-            json_out.close()
-            print("-----------------------")
-            print("[!] Theme entry addition successful")
-            print("-----------------------")
+    except FileExistsError:
+        file_exist = True
+
+    if(file_exist == False):
+        # open json file to get the file contents(json list)
+        with open(themelist_file, "rb") as json_file:
+            data = json.loads(json_file.read())
+        data.append(theme_obj)
+
+        writeJson(themelist_file, data)
+        print("-----------------------")
+        print("[!] Theme entry addition successful")
+        print("-----------------------")
     else:
         print(f"[!] {theme_file} : file already exists. Try giving new name to the theme.")
-        main()
+        return False
 
 def main():
-    year_dict = { 
-        '01': 'january', 
-        '02': 'february', 
-        '03': 'march', 
-        '04': 'april',
-        '05': 'may',
-        '06': 'june',
-        '07': 'july',
-        '08': 'august',
-        '09': 'september',
-        '10': 'october',
-        '11': 'november',
-        '12': 'december' 
+    # menu selection mapped to the function handling it
+    handlers = {
+        '1': createTimeline,
+        '2': createPost,
+        '3': createTheme
         }
 
-    print("\n>> Select function: \n   1. Create Timeline\n   2. Create post\n   3. Create Theme\n")
-    choice = input("\nSelection: ")
-    print("-----------------------")
+    while True:
+        print("\n>> Select function: \n   1. Create Timeline\n   2. Create post\n   3. Create Theme\n")
+        choice = input("\nSelection: ").strip()
+        print("-----------------------")
 
-    if(int(choice) == 1):
-        createTimeline(year_dict)
-    elif(int(choice) == 2):
-        createPost(year_dict)
-    elif(int(choice) == 3):
-        createTheme()
-    else:
-        print("[-] Please enter valid selection.")
-        main()
+        handler = handlers.get(choice)
+        if(handler is None):
+            print("[-] Please enter valid selection.")
+            continue
+
+        # a handler returning False sends the user back to the menu
+        if(handler() is False):
+            continue
+        break
 
 
 